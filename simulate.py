@@ -1,15 +1,54 @@
 import random
+import bisect
+import itertools
+import functools
 from abc import ABC, abstractmethod
-import csv
-import statistics
-import copy
-from typing import Dict
+from dataclasses import dataclass
+from typing import Dict, Iterator
 import math
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import numpy as np
+try:
+  from numba import config, njit, prange, set_num_threads
+  # the simulation forks worker processes, which can hang with the tbb and omp threading layers once numba has started its threads
+  config.THREADING_LAYER = 'workqueue'
+  HAS_NUMBA = True
+except ImportError: # numba is optional, the NumPy sim is used without it
+  HAS_NUMBA = False
+  prange = range
+  def njit(*args, **kwargs):
+    return lambda fn: fn
+
+# kinds of tiles so the board can be turned into arrays
+FLAT = 0
+GRAND_PRIZE = 1
+POINT_WHEEL = 2
+FATE_WHEEL = 3
+
+# number of ways to roll each sum from 2 to 12 with two dice
+two_dice_ways = (1, 2, 3, 4, 5, 6, 5, 4, 3, 2, 1)
+
+def _draws(population, weights: tuple[int, ...] = None, cum_weights: tuple[int, ...] = None, block_size: int = 1):
+  """Endlessly pick random values from the population. Values are drawn in blocks so each pick is just a next() call.
+  A new iterator should be made for every run so seeding random AND forking processes affect all of its values,
+  with blocks small enough that a run does not draw many values it never uses.
+
+  Args:
+    population (Sequence): Values to pick from
+    weights (tuple[int, ...], optional): Relative weight of each value. Defaults to equal weights.
+    cum_weights (tuple[int, ...], optional): Cumulative weight of each value, used instead of weights.
+    block_size (int, optional): Number of values to draw at a time. Defaults to 1.
+  """
+  while (True):
+    yield from random.choices(population, weights, cum_weights=cum_weights, k=block_size)
 
 #region classes
 class SimulationDetails:
   """Details about the simulation
   """
+  __slots__ = ('label', 'multipliers')
+
   def __init__(self, label: str, multipliers: Dict[int, list[int]]):
     self.label = label
     self.multipliers = multipliers
@@ -17,6 +56,8 @@ class SimulationDetails:
 class SimResultState:
   """The Sim Result Stats
   """
+  __slots__ = ('points', 'rolls_done', 'initial_dice', 'free_dice', 'gems', 'chroma', 'obsidian', 'otta', 'gold')
+
   def __init__(self, points: int = 0, rolls_done: int = 0, initial_dice: int = 0, free_dice: int = 0, gems: int = 0, chroma: int = 0, obsidian: int = 0, otta: int = 0, gold: int = 0):
     self.points = points
     self.rolls_done = rolls_done
@@ -31,6 +72,8 @@ class SimResultState:
 class SimResult:
   """Result of a simulation
   """
+  __slots__ = ('current_state', 'saved_state', 'points_bp_met', 'roll_dice_bp_met')
+
   points_breakpoints = [bp + s for s in [0, 20000, 40000, 60000, 80000] for bp in [2000, 5000, 8000, 12000, 16000, 20000]]
 
   roll_dice_task_breakpoints = [5, 10, 20, 30, 40, 60, 80, 100, 150, 200, 250, 300, 350, 400, 450, 500, 600]
@@ -38,7 +81,8 @@ class SimResult:
 
   def __init__(self):
     self.current_state = SimResultState()
-    self.saved_state: list[tuple[int, SimResultState]] = []
+    # (position, points, rolls_done, initial_dice, free_dice, gems, chroma, obsidian, otta, gold) after every roll
+    self.saved_state: list[tuple[int, ...]] = []
     self.points_bp_met = -1
     self.roll_dice_bp_met = -1
 
@@ -54,15 +98,10 @@ class SimResult:
     # add points to result
     self.current_state.points += num_points
 
-    # check if we met any points breakpoints
-    num_dice = 0
-    for bp in self.points_breakpoints[self.points_bp_met+1:]:
-      if (self.current_state.points < bp):
-        break
-      self.points_bp_met += 1
-      num_dice += 2
-
-    self.current_state.free_dice += num_dice
+    # check if we met any points breakpoints, each one gives 2 dice
+    new_bp = bisect.bisect_right(self.points_breakpoints, self.current_state.points) - 1
+    self.current_state.free_dice += 2 * (new_bp - self.points_bp_met)
+    self.points_bp_met = new_bp
   
   def add_rolls(self, num_rolls: int):
     """Add number of rolls to the result AND get the number of dice we get back from meeting Roll Dice task breakpoints
@@ -81,14 +120,20 @@ class SimResult:
       self.current_state.initial_dice += num_rolls - self.current_state.free_dice
     self.current_state.free_dice = max(0, self.current_state.free_dice - num_rolls)
 
-    # check if we meet any task breakpoints
-    num_dice = 0
-    for bp in self.roll_dice_task_breakpoints[self.roll_dice_bp_met+1:]:
-      if (self.current_state.rolls_done < bp):
-        break
-      self.roll_dice_bp_met += 1
-      num_dice = self.roll_dice_task_reward[self.roll_dice_bp_met]
+    # check if we meet any task breakpoints, we get the reward of the last one met
+    new_bp = bisect.bisect_right(self.roll_dice_task_breakpoints, self.current_state.rolls_done) - 1
+    if (new_bp > self.roll_dice_bp_met):
+      self.current_state.free_dice += self.roll_dice_task_reward[new_bp]
+      self.roll_dice_bp_met = new_bp
+
+  def add_reward(self, num_points: int, num_dice: int):
+    """Add the points AND dice gotten from landing on a tile
 
+    Args:
+      num_points (int): Number of points to add
+      num_dice (int): Number of dice to add
+    """
+    self.add_points(num_points)
     self.current_state.free_dice += num_dice
 
   def save(self, current_position):
@@ -97,12 +142,70 @@ class SimResult:
     Args:
       current_position (int): Current position that we are on
     """
-    self.saved_state.append([current_position, copy.deepcopy(self.current_state)])
+    state = self.current_state
+    self.saved_state.append((current_position, state.points, state.rolls_done, state.initial_dice, state.free_dice, state.gems, state.chroma, state.obsidian, state.otta, state.gold))
+
+class SimBatchResult:
+  """Results of a batch of simulation runs. Each stat is an array with one entry per run.
+  """
+  fields = ('points', 'rolls_done', 'initial_dice', 'free_dice', 'gems', 'chroma', 'obsidian', 'otta', 'gold')
+  __slots__ = fields + ('tiles_hit',)
+
+  def __init__(self, num_rounds: int):
+    self.points = np.zeros(num_rounds, dtype=np.int64)
+    self.rolls_done = np.zeros(num_rounds, dtype=np.int64)
+    self.initial_dice = np.zeros(num_rounds, dtype=np.int64)
+    self.free_dice = np.zeros(num_rounds, dtype=np.int64)
+    self.gems = np.zeros(num_rounds, dtype=np.int64)
+    self.chroma = np.zeros(num_rounds, dtype=np.int64)
+    self.obsidian = np.zeros(num_rounds, dtype=np.int64)
+    self.otta = np.zeros(num_rounds, dtype=np.int64)
+    self.gold = np.zeros(num_rounds, dtype=np.int64)
+    # number of times each tile was landed on across all runs
+    self.tiles_hit = np.zeros(24, dtype=np.int64)
+
+  def __len__(self):
+    return len(self.points)
+
+  @classmethod
+  def from_runs(cls, runs: list[SimResult]):
+    """Gather the results of single runs into a batch
+
+    Args:
+      runs (list[SimResult]): The simulation runs
+
+    Returns:
+      SimBatchResult: A batch with the runs in order. Tiles hit are counted from the saved history of the runs.
+    """
+    batch = cls(0)
+    for field in cls.fields:
+      setattr(batch, field, np.fromiter((getattr(run.current_state, field) for run in runs), dtype=np.int64, count=len(runs)))
+    positions = np.fromiter((state[0] for run in runs for state in run.saved_state), dtype=np.int64)
+    batch.tiles_hit = np.bincount(positions, minlength=24)
+    return batch
+
+  @classmethod
+  def concat(cls, batches: list['SimBatchResult']):
+    """Combine multiple batches into one
+
+    Args:
+      batches (list[SimBatchResult]): The batches to combine
+
+    Returns:
+      SimBatchResult: A batch with the runs of all batches in order
+    """
+    combined = cls(0)
+    for field in cls.fields:
+      setattr(combined, field, np.concatenate([getattr(batch, field) for batch in batches]))
+    combined.tiles_hit = sum(batch.tiles_hit for batch in batches)
+    return combined
 
 class Tile(ABC):
   """
   A single tile on the board
   """
+  __slots__ = ()
+
   def roll(self, multiplier: int, result: SimResult):
     """Do a dice roll from this tile
 
@@ -114,7 +217,7 @@ class Tile(ABC):
       int: The sum of the two dice results
     """
     result.add_rolls(multiplier)
-    return random.randint(1, 6) + random.randint(1, 6)
+    return random.choices(range(2, 13), two_dice_ways)[0]
 
   @abstractmethod
   def get_reward(self, multiplier: int, result: SimResult):
@@ -135,192 +238,225 @@ class Tile(ABC):
     """
     pass
 
+@dataclass(frozen=True, slots=True)
 class FlatTile(Tile):
-  def __init__(self, points: int = 0, gems: int = 0, dice: int = 0):
-    """Create a FlatTile that just gives the amount of resource
+  """A FlatTile that just gives the amount of resource
 
-    Args:
-      points (int, optional): Number of points. Defaults to 0.
-      gems (int, optional): Number of gems. Defaults to 0.
-      dice (int, optional): Number of dice. Defaults to 0.
-    """
-    self.points = points
-    self.gems = gems
-    self.dice = dice
+  Attributes:
+    points (int, optional): Number of points. Defaults to 0.
+    gems (int, optional): Number of gems. Defaults to 0.
+    dice (int, optional): Number of dice. Defaults to 0.
+  """
+  points: int = 0
+  gems: int = 0
+  dice: int = 0
+  kind = FLAT
 
   def get_reward(self, multiplier: int, result: SimResult):
-    result.add_points(self.points * multiplier)
-
-    result.current_state.gems += (self.gems * multiplier)
-
-    result.current_state.free_dice += (self.dice * multiplier)
+    result.add_reward(*_flat_reward((self.points, self.gems, self.dice), multiplier, result.current_state, None))
 
   def get_value(self):
     return self.points, self.dice
 
 class GrandPrizeTile(Tile):
+  __slots__ = ()
+  kind = GRAND_PRIZE
+  # the value never changes so it is only calculated once
+  _value = (0, (666 * 2 + 2666 * 1) / 10000)
+
   def get_reward(self, multiplier: int, result: SimResult):
-    spin = random.randint(1,10000)
-    if (spin <= 666): # 2x chroma keys
-      result.current_state.chroma += (2 * multiplier)
-    elif (spin <= 666 + 2666): # 1x obsidian key
-      result.current_state.obsidian += (1 * multiplier)
-    elif (spin <= 666 + 2666 + 2666): # 100 gems
-      result.current_state.gems += (100 * multiplier)
-    elif (spin <= 666 + 2666 + 2666 + 666): # 1x chroma key
-      result.current_state.chroma += (1 * multiplier)
-    elif (spin <= 666 + 2666 + 2666 + 666 + 666): # 2x dice
-      result.current_state.free_dice += (2 * multiplier)
-    else: # 1x dice
-      result.current_state.free_dice += (1 * multiplier)
+    result.add_reward(*_grand_prize_reward((), multiplier, result.current_state, _spins(GRAND_PRIZE)))
   
   def get_value(self):
-    return 0, (666 * 2 + 2666 * 1) / 10000
+    return self._value
 
 class PointWheelTile(Tile):
+  __slots__ = ()
+  kind = POINT_WHEEL
+  # the value never changes so it is only calculated once
+  # spin points * spin multipliers
+  _value = (((3478 * 100 + 3478 * 200 + 2608 * 500 + 434 * 1000) / 10000) * ((6153 * 1 + 3076 * 3 + 769 * 5) / 10000), 0)
+
   def get_reward(self, multiplier: int, result: SimResult):
-    spin = random.randint(1,10000)
-    points = 100
-    if (spin <= 3478):
-      points = 200
-    elif (spin <= 3478 + 2608):
-      points = 500
-    elif (spin <= 3478 + 2608 + 434):
-      points = 1000
-
-    spin2 = random.randint(1,10000)
-    spin_multiplier = 1
-    if (spin2 <= 3076):
-      spin_multiplier = 3
-    elif (spin2 <= 3076 + 769):
-      spin_multiplier = 5
-
-    result.add_points(points * spin_multiplier * multiplier)
+    result.add_reward(*_point_wheel_reward((), multiplier, result.current_state, _spins(POINT_WHEEL)))
   
   def get_value(self):
-    # spin points
-    point_value = (3478 * 100 + 3478 * 200 + 2608 * 500 + 434 * 1000) / 10000
-    # spin multipliers
-    point_value *= (6153 * 1 + 3076 * 3 + 769 * 5) / 10000
-    return point_value, 0
+    return self._value
 
 class FateWheelTile(Tile):
+  __slots__ = ()
+  kind = FATE_WHEEL
+  # the value never changes so it is only calculated once
+  _value = ((500 * 2500) / 10000, (1500 * 1) / 10000)
+
   def get_reward(self, multiplier: int, result: SimResult):
-    spin = random.randint(1,10000)
-    if (spin <= 2500): # 100 points
-      result.add_points(500 * multiplier)
-    elif (spin <= 2500 + 300): # 2x otta
-      result.current_state.otta += (2 * multiplier)
-    elif (spin <= 2500 + 300 + 700): # 1x chroma key
-      result.current_state.chroma += (1 * multiplier)
-    elif (spin <= 2500 + 300 + 700 + 1500): # 1x dice
-      result.current_state.free_dice += (1 * multiplier)
-    else: # 2000 gold
-      result.current_state.gold += (2000 * multiplier)
+    result.add_reward(*_fate_wheel_reward((), multiplier, result.current_state, _spins(FATE_WHEEL)))
   
   def get_value(self):
-    return (500 * 2500) / 10000, (1500 * 1) / 10000
+    return self._value
 #endregion classes
 
+#region rewards
+# The rewards of landing on each kind of tile as plain functions taking the flat (points, gems, dice) of the tile
+# so the sim can look them up by tile kind instead of calling a method on the tile.
+# The wheels also take the spins of their wheel in the current run.
+# They add the other resources to the state and return the points AND dice gotten so the sim can track those itself.
+def _flat_reward(params: tuple[int, int, int], multiplier: int, state: SimResultState, spins: None):
+  points, gems, dice = params
+  state.gems += (gems * multiplier)
+  return points * multiplier, dice * multiplier
+
+# cumulative spin thresholds (out of 10000) of each wheel outcome.
+# A spin gets the first outcome whose threshold it is <= to, or the last outcome if it is above every threshold.
+_GP_CUM = tuple(itertools.accumulate((666, 2666, 2666, 666, 666)))
+_PW_CUM = tuple(itertools.accumulate((3478, 2608, 434)))
+_PW_POINTS = (200, 500, 1000, 100)
+_PW_MULT_CUM = tuple(itertools.accumulate((3076, 769)))
+_PW_MULT = (3, 5, 1)
+
+def _combine_point_wheel():
+  """Combine the two spins of the point wheel into one spin out of 10000 * 10000 over every possible total
+
+  Returns:
+    tuple[tuple[int, ...], tuple[int, ...]]: Every possible total of points (ascending), Cumulative thresholds of each total
+  """
+  point_odds = [b - a for a, b in zip((0,) + _PW_CUM, _PW_CUM + (10000,))]
+  mult_odds = [b - a for a, b in zip((0,) + _PW_MULT_CUM, _PW_MULT_CUM + (10000,))]
+  odds: Dict[int, int] = {}
+  for points, point_odd in zip(_PW_POINTS, point_odds):
+    for spin_multiplier, mult_odd in zip(_PW_MULT, mult_odds):
+      odds[points * spin_multiplier] = odds.get(points * spin_multiplier, 0) + point_odd * mult_odd
+  totals = tuple(sorted(odds))
+  return totals, tuple(itertools.accumulate(odds[total] for total in totals))
+
+_PW_TOTALS, _PW_TOTALS_CUM = _combine_point_wheel()
+_FW_CUM = tuple(itertools.accumulate((2500, 300, 700, 1500)))
+
+# rewards of each wheel outcome (in the order of the cumulative spin thresholds), shared by every sim
+# columns: points, dice, gems, chroma, obsidian, otta, gold
+_GP_REWARDS = np.array([
+  [0, 0, 0, 2, 0, 0, 0],    # 2x chroma keys
+  [0, 0, 0, 0, 1, 0, 0],    # 1x obsidian key
+  [0, 0, 100, 0, 0, 0, 0],  # 100 gems
+  [0, 0, 0, 1, 0, 0, 0],    # 1x chroma key
+  [0, 2, 0, 0, 0, 0, 0],    # 2x dice
+  [0, 1, 0, 0, 0, 0, 0],    # 1x dice
+], dtype=np.int32)
+_FW_REWARDS = np.array([
+  [500, 0, 0, 0, 0, 0, 0],  # 500 points
+  [0, 0, 0, 0, 0, 2, 0],    # 2x otta
+  [0, 0, 0, 1, 0, 0, 0],    # 1x chroma key
+  [0, 1, 0, 0, 0, 0, 0],    # 1x dice
+  [0, 0, 0, 0, 0, 0, 2000], # 2000 gold
+], dtype=np.int32)
+# the same rewards as plain tuples for the single run sim
+_GP_OUTCOMES = tuple(map(tuple, _GP_REWARDS.tolist()))
+_FW_OUTCOMES = tuple(map(tuple, _FW_REWARDS.tolist()))
+
+def _wheel_outcome_reward(outcome: tuple[int, ...], multiplier: int, state: SimResultState):
+  points, dice, gems, chroma, obsidian, otta, gold = outcome
+  state.gems += (gems * multiplier)
+  state.chroma += (chroma * multiplier)
+  state.obsidian += (obsidian * multiplier)
+  state.otta += (otta * multiplier)
+  state.gold += (gold * multiplier)
+  return points * multiplier, dice * multiplier
+
+# outcomes of each kind of wheel AND their cumulative thresholds (the last outcome gets the rest up to 10000)
+_WHEELS = (
+  None,
+  (_GP_OUTCOMES, _GP_CUM + (10000,)),
+  (_PW_TOTALS, _PW_TOTALS_CUM),
+  (_FW_OUTCOMES, _FW_CUM + (10000,)),
+)
+
+def _spins(kind: int, block_size: int = 1):
+  """Start the spins of a kind of wheel, picked straight from the cumulative thresholds
+
+  Args:
+    kind (int): Kind of the wheel tile
+    block_size (int, optional): Number of spins to draw at a time. Defaults to 1.
+
+  Returns:
+    Iterator: The outcome of each spin
+  """
+  outcomes, cum_weights = _WHEELS[kind]
+  return _draws(outcomes, cum_weights=cum_weights, block_size=block_size)
+
+def _grand_prize_reward(params: tuple[int, int, int], multiplier: int, state: SimResultState, spins: Iterator[tuple[int, ...]]):
+  return _wheel_outcome_reward(next(spins), multiplier, state)
+
+def _point_wheel_reward(params: tuple[int, int, int], multiplier: int, state: SimResultState, spins: Iterator[int]):
+  return next(spins) * multiplier, 0
+
+def _fate_wheel_reward(params: tuple[int, int, int], multiplier: int, state: SimResultState, spins: Iterator[tuple[int, ...]]):
+  return _wheel_outcome_reward(next(spins), multiplier, state)
+
+# reward of each tile kind
+_REWARD_FNS = (_flat_reward, _grand_prize_reward, _point_wheel_reward, _fate_wheel_reward)
+#endregion rewards
+
 #region helpers
-def calc_best_multipliers(board: list[Tile], multiplier: int):
+@functools.lru_cache
+def _precompute_tile_values(board: tuple[Tile, ...]):
+  """Calculate the projected values of rolling from each tile of the board. These only depend on the board so they are cached.
+
+  Args:
+    board (tuple[Tile, ...]): The board
+
+  Returns:
+    tuple[np.ndarray, np.ndarray, np.ndarray]: Projected points, dice AND value of rolling from each tile
+  """
+  tile_values = np.array([tile.get_value() for tile in board], dtype=np.float64)
+  tile_points = tile_values[:, 0]
+  tile_dice = tile_values[:, 1]
+  #dice value = average points gained per die / (1 - average die gained per die)
+  dice_value = tile_points.mean() / (1 - tile_dice.mean())
+  # calculated value of tiles in terms of points with NO APPLIED MULTIPLIERS
+  tile_calc_values = tile_points + tile_dice * dice_value
+  # get the total value of each tile based on what tiles can be reached from it
+  # i.e. the sum over every roll of (ways to roll it / 36) * value of the tile that many spaces ahead
+  def get_values(values: np.ndarray):
+    return sum(ways / 36 * np.roll(values, -roll) for roll, ways in enumerate(two_dice_ways, start=2))
+  return get_values(tile_points), get_values(tile_dice), get_values(tile_calc_values)
+
+def calc_best_multipliers(board: tuple[Tile, ...], multiplier: int):
   """Calculate the best multipliers for the board
 
   Args:
-    board (list[Tile]): The board
+    board (tuple[Tile, ...]): The board
     multiplier (int): The multiplier to set around the board
 
   Returns:
     list[int]: The best multipliers to apply when rolling from each tile of the board
   """
-  tile_values: list[tuple[float,float]] = [tile.get_value() for tile in board]
-  #dice value = average points gained per die / (1 - average die gained per die)
-  dice_value = statistics.fmean([v[0] for v in tile_values]) / (1 - statistics.fmean([v[1] for v in tile_values]))
-  # calculated value of tiles in terms of points with NO APPLIED MULTIPLIERS
-  tile_calc_values = [v[0] + v[1]*dice_value for v in tile_values]
-  # get the total point value of each tile based on what tiles can be reached from it
-  def get_values(index: int, num_hits: int):
-    points = tile_values[index][0] * num_hits / 36
-    dice = tile_values[index][1] * num_hits / 36
-    value = tile_calc_values[index] * num_hits / 36
-    return points, dice, value
-  tile_mult_value: list[tuple[float, float, float]] = []
-  for i in range(len(tile_calc_values)):
-    total_points = 0
-    total_dice = 0
-    total_value = 0
-    # 2 → 1 way: (1+1)
-    points, dice, value = get_values((i + 2) % 24, 1)
-    total_points += points
-    total_dice += dice
-    total_value += value
-    # 3 → 2 ways: (1+2, 2+1)
-    points, dice, value = get_values((i + 3) % 24, 2)
-    total_points += points
-    total_dice += dice
-    total_value += value
-    # 4 → 3 ways: (1+3, 2+2, 3+1)
-    points, dice, value = get_values((i + 4) % 24, 3)
-    total_points += points
-    total_dice += dice
-    total_value += value
-    # 5 → 4 ways: (1+4, 2+3, 3+2, 4+1)
-    points, dice, value = get_values((i + 5) % 24, 4)
-    total_points += points
-    total_dice += dice
-    total_value += value
-    # 6 → 5 ways: (1+5, 2+4, 3+3, 4+2, 5+1)
-    points, dice, value = get_values((i + 6) % 24, 5)
-    total_points += points
-    total_dice += dice
-    total_value += value
-    # 7 → 6 ways: (1+6, 2+5, 3+4, 4+3, 5+2, 6+1)
-    points, dice, value = get_values((i + 7) % 24, 6)
-    total_points += points
-    total_dice += dice
-    total_value += value
-    # 8 → 5 ways: (2+6, 3+5, 4+4, 5+3, 6+2)
-    points, dice, value = get_values((i + 8) % 24, 5)
-    total_points += points
-    total_dice += dice
-    total_value += value
-    # 9 → 4 ways: (3+6, 4+5, 5+4, 6+3)
-    points, dice, value = get_values((i + 9) % 24, 4)
-    total_points += points
-    total_dice += dice
-    total_value += value
-    # 10 → 3 ways: (4+6, 5+5, 6+4)
-    points, dice, value = get_values((i + 10) % 24, 3)
-    total_points += points
-    total_dice += dice
-    total_value += value
-    # 11 → 2 ways: (5+6, 6+5)
-    points, dice, value = get_values((i + 11) % 24, 2)
-    total_points += points
-    total_dice += dice
-    total_value += value
-    # 12 → 1 way: (6+6)
-    points, dice, value = get_values((i + 12) % 24, 1)
-    total_points += points
-    total_dice += dice
-    total_value += value
-
-    tile_mult_value.append(tuple([total_points, total_dice, total_value]))
-
-  # sort the indices of the tile_mult_value such that the values are in descending order
-  sorted_index = sorted(range(len(tile_mult_value)), key=lambda i: tile_mult_value[i][2], reverse=True)
+  mult_points, mult_dice, mult_value = _precompute_tile_values(tuple(board))
+
+  # sort the indices of the tiles such that the values are in descending order
+  sorted_index = sorted(range(len(mult_value)), key=lambda i: mult_value[i], reverse=True)
+
+  mult_points, mult_dice = mult_points.tolist(), mult_dice.tolist()
 
   best_multiplier = [1] * 24
-  best_ppd = sum([best_multiplier[i] * tile_mult_value[i][2] for i in range(len(best_multiplier))]) / sum(best_multiplier)
+  best_ppd = sum([best_multiplier[i] * mult_value[i] for i in range(len(best_multiplier))]) / sum(best_multiplier)
+  # running sums of the multipliers and the multiplied projected points/dice, updated as each tile is flipped
+  sum_mult = len(best_multiplier)
+  sum_points = sum(mult_points)
+  sum_dice = sum(mult_dice)
+  delta = multiplier - 1
   for i in range(len(sorted_index)):
-    best_multiplier[sorted_index[i]] = multiplier
+    tile = sorted_index[i]
+    best_multiplier[tile] = multiplier
+    sum_mult += delta
+    sum_points += delta * mult_points[tile]
+    sum_dice += delta * mult_dice[tile]
 
     # Average Projected Dice Value = Sum(PDVxM) / Sum(Tile Multipliers)
-    avg_num_dice = sum([best_multiplier[j] * tile_mult_value[j][1] for j in range(len(best_multiplier))]) / sum(best_multiplier)
+    avg_num_dice = sum_dice / sum_mult
     # PPID = Sum(Project Points Value of Tile * Tile Multiplier) / Sum(Tile Multipliers) / (1 - Average Projected Dice Value)
-    ppd = sum([best_multiplier[j] * tile_mult_value[j][0] for j in range(len(best_multiplier))]) / sum(best_multiplier) / (1 - avg_num_dice)
+    ppd = sum_points / sum_mult / (1 - avg_num_dice)
     if (ppd < best_ppd):
-      best_multiplier[sorted_index[i]] = 1
+      best_multiplier[tile] = 1
       break
     best_ppd = ppd
   return best_multiplier
@@ -338,41 +474,19 @@ averages_output = '''Averages:
 - Otta shards gotten: {otta:,}
 - Gold gotten: {gold:,}
 '''
-def output_stats(runs: list[SimResult]):
+def output_stats(runs: SimBatchResult | list[SimResult]):
   """Output the stats of all the runs
 
   Args:
-    runs (list[SimResult]): The simulation runs
+    runs (SimBatchResult | list[SimResult]): The simulation runs
   """
+  if (isinstance(runs, list)):
+    runs = SimBatchResult.from_runs(runs)
   num_rounds = len(runs)
-  total_points = 0
-  total_rolls_done = 0
-  total_initial_dice = 0
-  total_free_dice = 0
-  total_gems = 0
-  total_chroma = 0
-  total_obsidian = 0
-  total_otta = 0
-  total_gold = 0
-  tiles_hit_freq = [0] * 24
-  for i in range(num_rounds):
-    run = runs[i]
-    total_points += run.current_state.points
-    total_rolls_done += run.current_state.rolls_done
-    total_initial_dice += run.current_state.initial_dice
-    total_free_dice += run.current_state.free_dice
-    total_gems += run.current_state.gems
-    total_chroma += run.current_state.chroma
-    total_obsidian += run.current_state.obsidian
-    total_otta += run.current_state.otta
-    total_gold += run.current_state.gold
-    for state in run.saved_state:
-      tiles_hit_freq[state[0]] += 1
-  
-  avg_points = total_points / num_rounds
-  avg_initial_dice = total_initial_dice / num_rounds
-  avg_free_dice = total_free_dice / num_rounds
-  avg_rolls = total_rolls_done / num_rounds
+  avg_points = runs.points.mean()
+  avg_initial_dice = runs.initial_dice.mean()
+  avg_free_dice = runs.free_dice.mean()
+  avg_rolls = runs.rolls_done.mean()
   print(averages_output.format(
     points=avg_points,
     initial_dice=avg_initial_dice,
@@ -380,35 +494,31 @@ def output_stats(runs: list[SimResult]):
     rolls=avg_rolls,
     ppd=avg_points / avg_rolls,
     free_dice=avg_free_dice,
-    gems=total_gems / num_rounds,
-    chroma=total_chroma / num_rounds,
-    obsidian=total_obsidian / num_rounds,
-    otta=total_otta / num_rounds,
-    gold=total_gold / num_rounds
+    gems=runs.gems.mean(),
+    chroma=runs.chroma.mean(),
+    obsidian=runs.obsidian.mean(),
+    otta=runs.otta.mean(),
+    gold=runs.gold.mean()
   ))
-  for i in range(len(tiles_hit_freq)):
-    tiles_hit_freq[i] /= num_rounds
+  tiles_hit_freq = (runs.tiles_hit / num_rounds).tolist()
   print(f'Tiles hit frequencies: {tiles_hit_freq}')
 
-def output_csv(csv_file_name: str, runs: list[SimResult]):
+def output_csv(csv_file_name: str, runs: SimBatchResult):
   header = ['# of Points', '# of Dice Initially', 'Points per Initial Dice', '# of Rolls Done', 'Points per Roll', '# of Gems', '# of Chroma Keys', '# of Obsidian Keys', '# of Otta Shards', '# of Gold']
-  with open(f'generated/{csv_file_name}', 'w', newline='') as csvfile:
-      csvwriter = csv.writer(csvfile, delimiter=',', quotechar='|', quoting=csv.QUOTE_MINIMAL)
-      csvwriter.writerow(header)
-      for run in runs:
-        row = [
-          run.current_state.points,
-          run.current_state.initial_dice,
-          run.current_state.points / run.current_state.initial_dice,
-          run.current_state.rolls_done,
-          run.current_state.points / run.current_state.rolls_done,
-          run.current_state.gems,
-          run.current_state.chroma,
-          run.current_state.obsidian,
-          run.current_state.otta,
-          run.current_state.gold
-        ]
-        csvwriter.writerow(row)
+  data = np.column_stack([
+    runs.points,
+    runs.initial_dice,
+    runs.points / runs.initial_dice,
+    runs.rolls_done,
+    runs.points / runs.rolls_done,
+    runs.gems,
+    runs.chroma,
+    runs.obsidian,
+    runs.otta,
+    runs.gold
+  ])
+  fmt = ['%d', '%d', '%.6g', '%d', '%.6g', '%d', '%d', '%d', '%d', '%d']
+  np.savetxt(f'generated/{csv_file_name}', data, fmt=fmt, delimiter=',', header=','.join(header), comments='')
 
 def create_sim_details_same_mult(label: str, multipliers: list[int]):
   """Create a SimulationDetails with the same multiplier map at every level
@@ -426,13 +536,67 @@ def create_sim_details_same_mult(label: str, multipliers: list[int]):
     5: multipliers,
     10: multipliers,
   })
+
+def _board_arrays(board: tuple[Tile, ...]):
+  """Turn the board into arrays so it can be used by the vectorized sim
+
+  Args:
+    board (tuple[Tile, ...]): The board
+
+  Returns:
+    tuple[np.ndarray, np.ndarray]: Kind of each tile, Flat points/gems/dice of each tile (0 for wheels)
+  """
+  tile_kind = np.array([tile.kind for tile in board], dtype=np.int8)
+  tile_params = np.zeros((len(board), 3), dtype=np.int32)
+  for i, tile in enumerate(board):
+    if (tile.kind == FLAT):
+      tile_params[i] = (tile.points, tile.gems, tile.dice)
+  return tile_kind, tile_params
+
+# tier of the multiplier table to use for each number of turns left, anything >= 100 uses the last entry
+_TIER_LUT = np.array([0] * 20 + [1] * 10 + [2] * 20 + [3] * 50 + [4], dtype=np.int8)
+
+def _multiplier_table(multipliers: Dict[int,list[int]]):
+  """Turn the multipliers into a table with one row per tier of number of turns left (<20, <30, <50, <100, >=100)
+
+  Args:
+    multipliers (Dict[int,list[int]]): The multipliers to apply when rolling from each tile
+
+  Returns:
+    np.ndarray: The multiplier of each tile at each tier, already capped to what is allowed at that tier
+  """
+  return np.stack([
+    np.ones(24),
+    np.minimum(multipliers[2], 2),
+    np.minimum(multipliers[3], 3),
+    np.minimum(multipliers[5], 5),
+    multipliers[10],
+  ]).astype(np.int8)
+
+@functools.lru_cache
+def _single_run_tables(board: tuple[Tile, ...], multipliers: tuple[tuple[int, ...], ...]):
+  """Flatten the board AND multipliers into the plain lists the single run sim looks up every roll. These only depend on the board AND multipliers so they are cached.
+
+  Args:
+    board (tuple[Tile, ...]): The board
+    multipliers (tuple[tuple[int, ...], ...]): The multipliers of the 2x, 3x, 5x AND 10x maps
+
+  Returns:
+    tuple[list, list, list, list, list]: Kind of each tile, Reward function of each tile, Flat points/gems/dice of each tile, Multiplier table, Tier of each number of turns left
+  """
+  tile_kind, tile_params = _board_arrays(board)
+  tile_kind = tile_kind.tolist()
+  tile_rewards = [_REWARD_FNS[kind] for kind in tile_kind]
+  tile_params = [tuple(params) for params in tile_params.tolist()]
+  mult_table = _multiplier_table(dict(zip((2, 3, 5, 10), multipliers))).tolist()
+  return tile_kind, tile_rewards, tile_params, mult_table, _TIER_LUT.tolist()
 #endregion helpers
 
-def simulate_single_run(board: list[Tile], multipliers: Dict[int,list[int]], num_dice_rolls: int, points_to_meet: int, save_history: bool = False):
+def simulate_single_run(board: tuple[Tile, ...], multipliers: Dict[int,list[int]], num_dice_rolls: int, points_to_meet: int, save_history: bool = False):
   """Simulate going around the board starting with a specified number of dice rolls
 
   Args:
-    board (list[Tile]): The board
+    board (tuple[Tile, ...]): The board
     multipliers (Dict[int,list[int]]): The multipliers to apply when rolling from each tile
     num_dice_rolls (int): Number of dice to start with. The sim will stop if all of these dice are used.
     points_to_meet (int): Number of points to aim for. The sim will stop if we reach this threshold even if we didn't use all starting dice.
@@ -441,72 +605,379 @@ def simulate_single_run(board: list[Tile], multipliers: Dict[int,list[int]], num
   Returns:
     SimResult: Result of simulation
   """
+  tile_kind, tile_rewards, tile_params, mult_table, tier_lut = _single_run_tables(tuple(board), tuple(tuple(multipliers[tier]) for tier in (2, 3, 5, 10)))
+  # the random values are drawn for this run only, in small blocks as a run only has a few hundred rolls at most
+  dice_rolls = _draws(range(2, 13), two_dice_ways, block_size=32)
+  run_spins = [None] + [_spins(kind, 4) for kind in (GRAND_PRIZE, POINT_WHEEL, FATE_WHEEL)]
+  tile_spins = [run_spins[kind] for kind in tile_kind]
+  points_breakpoints = SimResult.points_breakpoints
+  roll_dice_task_breakpoints = SimResult.roll_dice_task_breakpoints
+  roll_dice_task_reward = SimResult.roll_dice_task_reward
   result = SimResult()
+  state = result.current_state
+  # the points, rolls and dice are kept in locals while simulating and only written to the result at the end
+  points = 0
+  rolls_done = 0
+  initial_dice = 0
+  free_dice = 0
+  points_bp_met = -1
+  roll_dice_bp_met = -1
   current_position = 0
-  while (result.current_state.points < points_to_meet and (result.current_state.initial_dice < num_dice_rolls or result.current_state.free_dice > 0)) :
-    # get multiplier then check if it's allowed
-    num_turns = num_dice_rolls - result.current_state.initial_dice + result.current_state.free_dice
-    list_of_multipliers = [ 1 ] * 24
-    if (num_turns >= 100):
-      list_of_multipliers = multipliers[10]
-    elif (num_turns >= 50):
-      list_of_multipliers = multipliers[5]
-    elif (num_turns >= 30):
-      list_of_multipliers = multipliers[3]
-    elif (num_turns >= 20):
-      list_of_multipliers = multipliers[2]
-    multiplier = list_of_multipliers[current_position]
-    if (num_turns < 20):
-      multiplier = min(1, multiplier)
-    elif (num_turns < 30):
-      multiplier = min(2, multiplier)
-    elif (num_turns < 50):
-      multiplier = min(3, multiplier)
-    elif (num_turns < 100):
-      multiplier = min(5, multiplier)
+  while (points < points_to_meet and (initial_dice < num_dice_rolls or free_dice > 0)):
+    # get multiplier allowed with the number of turns left
+    multiplier = mult_table[tier_lut[min(num_dice_rolls - initial_dice + free_dice, 100)]][current_position]
 
-    # roll the dice
-    old_tile = board[current_position]
-    roll = old_tile.roll(multiplier, result)
+    # roll the dice, ONLY using initial dice IF we run out of free dice
+    rolls_done += multiplier
+    if (free_dice <= multiplier):
+      initial_dice += multiplier - free_dice
+      free_dice = 0
+    else:
+      free_dice -= multiplier
+    # check if we meet any task breakpoints, we get the reward of the last one met
+    new_bp = bisect.bisect_right(roll_dice_task_breakpoints, rolls_done) - 1
+    if (new_bp > roll_dice_bp_met):
+      free_dice += roll_dice_task_reward[new_bp]
+      roll_dice_bp_met = new_bp
+    current_position = (current_position + next(dice_rolls)) % 24
 
     # land on new tile and get the reward
-    current_position = (current_position + roll) % 24
-    tile = board[current_position]
-    tile.get_reward(multiplier, result)
+    num_points, num_dice = tile_rewards[current_position](tile_params[current_position], multiplier, state, tile_spins[current_position])
+    free_dice += num_dice
+    if (num_points > 0):
+      points += num_points
+      # check if we met any points breakpoints, each one gives 2 dice
+      new_bp = bisect.bisect_right(points_breakpoints, points) - 1
+      free_dice += 2 * (new_bp - points_bp_met)
+      points_bp_met = new_bp
 
     # save history
     if (save_history):
+      state.points, state.rolls_done, state.initial_dice, state.free_dice = points, rolls_done, initial_dice, free_dice
       result.save(current_position)
-  
+
+  state.points, state.rolls_done, state.initial_dice, state.free_dice = points, rolls_done, initial_dice, free_dice
+  result.points_bp_met = points_bp_met
+  result.roll_dice_bp_met = roll_dice_bp_met
   return result
 
-def simulation(sim_details: list[SimulationDetails], board: list[Tile], num_rounds: int, num_dices: list[int], points_to_meet: int, csv: bool = False, save_history: bool = False):
+class _DrawPool:
+  """Random integers drawn in large blocks and handed out in slices so the vectorized sim does not call the generator every step
+  """
+  __slots__ = ('rng', 'low', 'high', 'dtype', 'block_size', 'values', 'index')
+
+  def __init__(self, rng: np.random.Generator, low: int, high: int, dtype: type, block_size: int = 1 << 20):
+    """Create a pool of random integers in [low, high)
+
+    Args:
+      rng (np.random.Generator): Generator to draw from
+      low (int): Lowest value (inclusive)
+      high (int): Highest value (exclusive)
+      dtype (type): Type of the values
+      block_size (int, optional): Number of values to draw at a time. Defaults to 1 << 20.
+    """
+    self.rng = rng
+    self.low = low
+    self.high = high
+    self.dtype = dtype
+    self.block_size = block_size
+    self.values = np.empty(0, dtype=dtype)
+    self.index = 0
+
+  def take(self, size: int):
+    """Take the next values of the pool, drawing a new block if there are not enough left
+
+    Args:
+      size (int): Number of values to take
+
+    Returns:
+      np.ndarray: The values
+    """
+    if (self.index + size > len(self.values)):
+      self.values = self.rng.integers(self.low, self.high, size=max(self.block_size, size), dtype=self.dtype)
+      self.index = 0
+    values = self.values[self.index:self.index + size]
+    self.index += size
+    return values
+
+# columns of the wheel rewards for the vectorized sims
+_GP_CHROMA = np.ascontiguousarray(_GP_REWARDS[:, 3])
+_GP_OBSIDIAN = np.ascontiguousarray(_GP_REWARDS[:, 4])
+_GP_GEMS = np.ascontiguousarray(_GP_REWARDS[:, 2])
+_GP_DICE = np.ascontiguousarray(_GP_REWARDS[:, 1])
+_FW_POINTS = np.ascontiguousarray(_FW_REWARDS[:, 0])
+_FW_OTTA = np.ascontiguousarray(_FW_REWARDS[:, 5])
+_FW_CHROMA = np.ascontiguousarray(_FW_REWARDS[:, 3])
+_FW_DICE = np.ascontiguousarray(_FW_REWARDS[:, 1])
+_FW_GOLD = np.ascontiguousarray(_FW_REWARDS[:, 6])
+# most points a run of the NumPy sim can aim for, leaving room for the last reward to fit in int32
+_MAX_POINTS = 2**30
+
+def simulate_batch(board: tuple[Tile, ...], multipliers: Dict[int,list[int]], num_dice_rolls: int, points_to_meet: int, num_rounds: int, save_history: bool = False):
+  """Simulate many runs going around the board starting with a specified number of dice rolls.
+  Uses the compiled sim if numba is installed, otherwise the NumPy sim.
+
+  Args:
+    board (tuple[Tile, ...]): The board
+    multipliers (Dict[int,list[int]]): The multipliers to apply when rolling from each tile
+    num_dice_rolls (int): Number of dice to start with. A run will stop if all of these dice are used.
+    points_to_meet (int): Number of points to aim for. A run will stop if we reach this threshold even if we didn't use all starting dice.
+    num_rounds (int): Number of runs to simulate
+    save_history (bool): Whether we should count the tiles landed on.
+
+  Returns:
+    SimBatchResult: Results of all runs
+  """
+  if (HAS_NUMBA):
+    return _simulate_batch_numba(board, multipliers, num_dice_rolls, points_to_meet, num_rounds, save_history)
+  return _simulate_batch_numpy(board, multipliers, num_dice_rolls, points_to_meet, num_rounds, save_history)
+
+def _simulate_batch_numpy(board: tuple[Tile, ...], multipliers: Dict[int,list[int]], num_dice_rolls: int, points_to_meet: int, num_rounds: int, save_history: bool = False):
+  """Simulate many runs at once. Every run still in progress does one roll per step so the whole batch is updated with array operations.
+  Takes the same arguments as simulate_batch.
+  """
+  rng = np.random.Generator(np.random.SFC64())
+  dice = _DrawPool(rng, 1, 7, np.uint8)
+  spins = _DrawPool(rng, 1, 10001, np.uint16)
+  point_wheel_spins = _DrawPool(rng, 1, _PW_TOTALS_CUM[-1] + 1, np.uint32)
+  tile_kind, tile_params = _board_arrays(board)
+  mult_table = _multiplier_table(multipliers)
+  points_breakpoints = np.array(SimResult.points_breakpoints, dtype=np.int32)
+  roll_dice_task_breakpoints = np.array(SimResult.roll_dice_task_breakpoints, dtype=np.int32)
+  roll_dice_task_reward = np.array(SimResult.roll_dice_task_reward, dtype=np.int32)
+  # the state is kept in int32 so stop the runs well before points could overflow
+  points_to_meet = min(points_to_meet, _MAX_POINTS)
+
+  batch = SimBatchResult(num_rounds)
+  # state of the runs still being simulated, one row per stat
+  run_index = np.arange(num_rounds)
+  state = np.zeros((len(SimBatchResult.fields), num_rounds), dtype=np.int32)
+  position = np.zeros(num_rounds, dtype=np.uint8)
+  points_bp_met = np.full(num_rounds, -1)
+  roll_dice_bp_met = np.full(num_rounds, -1)
+  points, rolls_done, initial_dice, free_dice, gems, chroma, obsidian, otta, gold = state
+
+  def write_back():
+    for field, values in zip(SimBatchResult.fields, state):
+      getattr(batch, field)[run_index] = values
+
+  while (True):
+    alive = (points < points_to_meet) & ((initial_dice < num_dice_rolls) | (free_dice > 0))
+    num_alive = np.count_nonzero(alive)
+    if (num_alive == 0):
+      break
+    # drop finished runs once they are a big part of the batch
+    if (num_alive < 0.7 * len(alive)):
+      write_back()
+      run_index, state, position, points_bp_met, roll_dice_bp_met = run_index[alive], state[:, alive], position[alive], points_bp_met[alive], roll_dice_bp_met[alive]
+      points, rolls_done, initial_dice, free_dice, gems, chroma, obsidian, otta, gold = state
+      alive = alive[alive]
+
+    # get multiplier allowed with the number of turns left. Finished runs get 0 so nothing changes for them.
+    num_turns = num_dice_rolls - initial_dice + free_dice
+    tier = _TIER_LUT[np.minimum(num_turns, 100).astype(np.intp)]
+    multiplier = mult_table[tier, position]
+    multiplier *= alive
+
+    # roll the dice
+    rolls_done += multiplier
+    initial_dice += np.maximum(multiplier - free_dice, 0)
+    np.maximum(free_dice - multiplier, 0, out=free_dice)
+    new_roll_dice_bp = np.searchsorted(roll_dice_task_breakpoints, rolls_done, side='right') - 1
+    free_dice += np.where(new_roll_dice_bp > roll_dice_bp_met, roll_dice_task_reward[new_roll_dice_bp], 0)
+    roll_dice_bp_met = new_roll_dice_bp
+    faces = dice.take(2 * len(position))
+    position = (position + faces[:len(position)] + faces[len(position):]) % 24
+
+    # land on new tile and get the reward
+    new_points = tile_params[position, 0] * multiplier
+    gems += tile_params[position, 1] * multiplier
+    free_dice += tile_params[position, 2] * multiplier
+    kind = tile_kind[position]
+
+    hit = np.flatnonzero(kind == GRAND_PRIZE)
+    if (len(hit) > 0):
+      outcome = np.searchsorted(_GP_CUM, spins.take(len(hit)))
+      chroma[hit] += _GP_CHROMA[outcome] * multiplier[hit]
+      obsidian[hit] += _GP_OBSIDIAN[outcome] * multiplier[hit]
+      gems[hit] += _GP_GEMS[outcome] * multiplier[hit]
+      free_dice[hit] += _GP_DICE[outcome] * multiplier[hit]
+
+    hit = np.flatnonzero(kind == POINT_WHEEL)
+    if (len(hit) > 0):
+      spin_points = np.take(_PW_TOTALS, np.searchsorted(_PW_TOTALS_CUM, point_wheel_spins.take(len(hit))))
+      new_points[hit] += spin_points * multiplier[hit]
+
+    hit = np.flatnonzero(kind == FATE_WHEEL)
+    if (len(hit) > 0):
+      outcome = np.searchsorted(_FW_CUM, spins.take(len(hit)))
+      new_points[hit] += _FW_POINTS[outcome] * multiplier[hit]
+      otta[hit] += _FW_OTTA[outcome] * multiplier[hit]
+      chroma[hit] += _FW_CHROMA[outcome] * multiplier[hit]
+      free_dice[hit] += _FW_DICE[outcome] * multiplier[hit]
+      gold[hit] += _FW_GOLD[outcome] * multiplier[hit]
+
+    # add points AND get the dice back from meeting points breakpoints
+    points += new_points
+    new_points_bp = np.searchsorted(points_breakpoints, points, side='right') - 1
+    free_dice += 2 * (new_points_bp - points_bp_met)
+    points_bp_met = new_points_bp
+
+    # save history
+    if (save_history):
+      batch.tiles_hit += np.bincount(position[alive], minlength=24)
+
+  write_back()
+  return batch
+
+@njit(parallel=True, cache=True)
+def _run_many(tile_kind, tile_params, mult_table, num_dice_rolls, points_to_meet, points_breakpoints, roll_dice_task_breakpoints, roll_dice_task_reward, out_state, out_tiles_hit):
+  """Compiled sim of every run in parallel. Writes the final state of each run into out_state (one row per SimBatchResult field)
+  and the number of times each run landed on each tile into out_tiles_hit if it has a row per run.
+  """
+  save_history = out_tiles_hit.shape[0] > 0
+  for run in prange(out_state.shape[1]):
+    points = 0
+    rolls_done = 0
+    initial_dice = 0
+    free_dice = 0
+    gems = 0
+    chroma = 0
+    obsidian = 0
+    otta = 0
+    gold = 0
+    position = 0
+    points_bp_met = -1
+    roll_dice_bp_met = -1
+    while (points < points_to_meet and (initial_dice < num_dice_rolls or free_dice > 0)):
+      # get multiplier allowed with the number of turns left
+      num_turns = num_dice_rolls - initial_dice + free_dice
+      multiplier = mult_table[_TIER_LUT[int(min(num_turns, 100))], position]
+
+      # roll the dice
+      rolls_done += multiplier
+      if (free_dice <= multiplier):
+        initial_dice += multiplier - free_dice
+        free_dice = 0
+      else:
+        free_dice -= multiplier
+      num_dice = 0
+      while (roll_dice_bp_met + 1 < len(roll_dice_task_breakpoints) and rolls_done >= roll_dice_task_breakpoints[roll_dice_bp_met + 1]):
+        roll_dice_bp_met += 1
+        num_dice = roll_dice_task_reward[roll_dice_bp_met]
+      free_dice += num_dice
+      position = (position + np.random.randint(1, 7) + np.random.randint(1, 7)) % 24
+
+      # land on new tile and get the reward
+      new_points = 0
+      kind = tile_kind[position]
+      if (kind == FLAT):
+        new_points = tile_params[position, 0] * multiplier
+        gems += tile_params[position, 1] * multiplier
+        free_dice += tile_params[position, 2] * multiplier
+      elif (kind == GRAND_PRIZE):
+        outcome = np.searchsorted(_GP_CUM, np.random.randint(1, 10001))
+        chroma += _GP_CHROMA[outcome] * multiplier
+        obsidian += _GP_OBSIDIAN[outcome] * multiplier
+        gems += _GP_GEMS[outcome] * multiplier
+        free_dice += _GP_DICE[outcome] * multiplier
+      elif (kind == POINT_WHEEL):
+        spin_points = _PW_TOTALS[np.searchsorted(_PW_TOTALS_CUM, np.random.randint(1, _PW_TOTALS_CUM[-1] + 1))]
+        new_points = spin_points * multiplier
+      else:
+        outcome = np.searchsorted(_FW_CUM, np.random.randint(1, 10001))
+        new_points = _FW_POINTS[outcome] * multiplier
+        otta += _FW_OTTA[outcome] * multiplier
+        chroma += _FW_CHROMA[outcome] * multiplier
+        free_dice += _FW_DICE[outcome] * multiplier
+        gold += _FW_GOLD[outcome] * multiplier
+
+      # add points AND get the dice back from meeting points breakpoints
+      points += new_points
+      while (points_bp_met + 1 < len(points_breakpoints) and points >= points_breakpoints[points_bp_met + 1]):
+        points_bp_met += 1
+        free_dice += 2
+
+      # save history
+      if (save_history):
+        out_tiles_hit[run, position] += 1
+
+    out_state[0, run] = points
+    out_state[1, run] = rolls_done
+    out_state[2, run] = initial_dice
+    out_state[3, run] = free_dice
+    out_state[4, run] = gems
+    out_state[5, run] = chroma
+    out_state[6, run] = obsidian
+    out_state[7, run] = otta
+    out_state[8, run] = gold
+
+def _simulate_batch_numba(board: tuple[Tile, ...], multipliers: Dict[int,list[int]], num_dice_rolls: int, points_to_meet: int, num_rounds: int, save_history: bool = False):
+  """Simulate many runs with the compiled sim. Takes the same arguments as simulate_batch.
+  """
+  tile_kind, tile_params = _board_arrays(board)
+  out_state = np.zeros((len(SimBatchResult.fields), num_rounds), dtype=np.int64)
+  out_tiles_hit = np.zeros((num_rounds if save_history else 0, 24), dtype=np.int64)
+  _run_many(tile_kind, tile_params, _multiplier_table(multipliers), float(num_dice_rolls), float(points_to_meet),
+    np.array(SimResult.points_breakpoints), np.array(SimResult.roll_dice_task_breakpoints), np.array(SimResult.roll_dice_task_reward),
+    out_state, out_tiles_hit)
+
+  batch = SimBatchResult(num_rounds)
+  for field, values in zip(SimBatchResult.fields, out_state):
+    setattr(batch, field, values)
+  batch.tiles_hit = out_tiles_hit.sum(axis=0)
+  return batch
+
+sims_per_chunk = 10_000
+
+def _warm():
+  """Compile the compiled sim (or load it from the numba cache) with a tiny run so the first real sim does not pay for it
+  """
+  if (HAS_NUMBA):
+    _simulate_batch_numba([FlatTile()] * 24, create_sim_details_same_mult('warm', [1] * 24).multipliers, 1, 1, 1)
+
+def _init_worker():
+  """Set up a worker process of the simulation
+  """
+  if (HAS_NUMBA):
+    # every core already has its own worker so the compiled sim does not need more threads
+    set_num_threads(1)
+    _warm()
+
+def simulation(sim_details: list[SimulationDetails], board: tuple[Tile, ...], num_rounds: int, num_dices: list[int], points_to_meet: int, csv: bool = False, save_history: bool = False):
   """Run simulations to get the average PPID using a specified number of starting dice. A single run will only end after all starting dice and free dice received in the run are used.
 
   Args:
     sim_details (list[SimulationDetails]): List of multipliers to run
-    board (list[Tile]): The board
+    board (tuple[Tile, ...]): The board
     num_rounds (int): The number of times to run simulation
     num_dices (list[int]): List of the number of dice to start each simulation with
     points_to_meet (int): Number of points to aim for. The sim will stop if we reach this threshold even if we didn't use all starting dice.
     output_csv (bool): Whether we should output the runs in a CSV
-    save_history (bool): Whether we should save the state of run after every single roll. Will slow down sim.
+    save_history (bool): Whether we should count the tiles landed on in every run.
   """
-  for sim in sim_details:
-    runs = []
-    print(sim.label)
-    for dices in num_dices:
-      print('Simulation of {:,} players starting with {:,} dice each trying to reach {:,} points:'.format(num_rounds, dices, points_to_meet))
-      print('Applied Multipliers: {}'.format(sim.multipliers))
-      for i in range(num_rounds):
-        runs.append(simulate_single_run(board, sim.multipliers, dices, points_to_meet, save_history))
-        if (i % 10000 == 9999):
-          print(f'{i+1} sims done')
-      output_stats(runs)
-    if (csv):
-      output_csv(f'{sim.label}.csv', runs)
-
-board = [
+  # runs are independent so they are split into chunks that are simulated across all cores
+  with ProcessPoolExecutor(max_workers=os.cpu_count(), initializer=_init_worker) as executor:
+    for sim in sim_details:
+      runs = SimBatchResult(0)
+      print(sim.label)
+      for dices in num_dices:
+        print('Simulation of {:,} players starting with {:,} dice each trying to reach {:,} points:'.format(num_rounds, dices, points_to_meet))
+        print('Applied Multipliers: {}'.format(sim.multipliers))
+        chunks = [
+          executor.submit(simulate_batch, board, sim.multipliers, dices, points_to_meet, min(sims_per_chunk, num_rounds - start), save_history)
+          for start in range(0, num_rounds, sims_per_chunk)
+        ]
+        num_done = 0
+        for chunk in as_completed(chunks):
+          num_done += len(chunk.result())
+          print(f'{num_done} sims done')
+        runs = SimBatchResult.concat([runs] + [chunk.result() for chunk in chunks])
+        output_stats(runs)
+      if (csv):
+        output_csv(f'{sim.label}.csv', runs)
+
+board = (
   FlatTile(points=400),
   FlatTile(gems=50),
   FlatTile(points=50),
@@ -531,7 +1002,7 @@ board = [
   FlatTile(),           # GREEN PRESENT
   FateWheelTile(),
   FlatTile(points=200),
-]
+)
 
 sims = [
   SimulationDetails('BestMultipliers', {
@@ -656,3 +1127,6 @@ sims = [
 #           ]
 #           csvwriter.writerow(row)
 #   output_results_into_csv()
+
+if __name__ == '__main__':
+  _warm()